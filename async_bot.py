@@ -0,0 +1,122 @@
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from exceptions import BadAPIRequest, ErrorResponse, TelegramError
+from http_client import parse_retry_after
+from response_cache import NOT_MODIFIED, ResponseCache
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+TELEGRAM_API = 'https://api.telegram.org/bot{token}/sendMessage'
+
+
+class AsyncTransport:
+    """Асинхронные запросы к API Практикума и отправка в Telegram.
+
+    При установленном aiohttp запросы выполняются в цикле событий,
+    иначе синхронные функции запускаются в пуле потоков.
+    """
+
+    def __init__(self, endpoint, telegram_token, concurrency,
+                 fetch_sync, send_sync, cache=None):
+        self.endpoint = endpoint
+        self.telegram_url = TELEGRAM_API.format(token=telegram_token)
+        self.concurrency = concurrency
+        self._fetch_sync = fetch_sync
+        self._send_sync = send_sync
+        self.cache = cache or ResponseCache()
+        self._session = None
+        self._executor = None
+
+    async def __aenter__(self):
+        if aiohttp is not None:
+            connector = aiohttp.TCPConnector(limit=self.concurrency)
+            self._session = aiohttp.ClientSession(connector=connector)
+        else:
+            self._executor = ThreadPoolExecutor(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self._session is not None:
+            await self._session.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    async def _in_thread(self, func, *args):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def fetch(self, tenant):
+        """Условный запрос статусов домашних работ подписки."""
+        if self._session is None:
+            return await self._in_thread(self._fetch_sync, tenant)
+        key = tenant.tenant_id
+        headers = self.cache.prepare(key, tenant.headers)
+        allowed = (200, NOT_MODIFIED) if 'If-None-Match' in headers else (200,)
+        params = {'from_date': tenant.from_date}
+        try:
+            async with self._session.get(self.endpoint, headers=headers,
+                                         params=params) as response:
+                if response.status not in allowed:
+                    text = await response.text()
+                    retry_after = response.headers.get('Retry-After')
+                    raise ErrorResponse(
+                        f'Неудовлетворительный статус ответа:'
+                        f' {response.status},'
+                        f' Причина: {response.reason},'
+                        f' Текст ответа: {text},'
+                        f' с параметрами: {params}',
+                        parse_retry_after(retry_after))
+                body = await response.read()
+                return self.cache.decode(key, response.status,
+                                         response.headers.get('ETag'), body)
+        except Exception as error:
+            raise BadAPIRequest(error)
+
+    async def send(self, chat_id, message):
+        """Отправка сообщения в Telegram чат."""
+        if self._session is None:
+            return await self._in_thread(self._send_sync, chat_id, message)
+        payload = {'chat_id': chat_id, 'text': message}
+        try:
+            async with self._session.post(self.telegram_url,
+                                          json=payload) as response:
+                result = await response.json()
+        except Exception:
+            raise TelegramError(f'Сбои при отправке сообщения в Telegram: '
+                                f'{message}')
+        if not result.get('ok'):
+            raise TelegramError(f'Сбои при отправке сообщения в Telegram: '
+                                f'{message}, ответ: {result}')
+        logging.info(f'Сообщение успешно отправлено: {message}')
+
+
+async def run_async(scheduler, transport, poll, concurrency, stop=None):
+    """Опрос подписок в цикле событий не более чем concurrency за раз."""
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = set()
+
+    async def worker(tenant):
+        error = None
+        try:
+            error = await poll(transport, tenant)
+        finally:
+            scheduler.reschedule(tenant, error)
+            semaphore.release()
+
+    async with transport:
+        while stop is None or not stop.is_set():
+            delay = scheduler.delay()
+            if delay > 0:
+                await asyncio.sleep(min(delay, 1))
+                continue
+            await semaphore.acquire()
+            task = asyncio.ensure_future(worker(scheduler.pop()))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.wait(tasks)
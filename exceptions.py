@@ -1,7 +1,9 @@
 class ErrorResponse(Exception):
     """Error response."""
 
-    pass
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
 
 
 class HTTPStatusError(Exception):
@@ -11,7 +13,12 @@ class HTTPStatusError(Exception):
 
 class BadAPIRequest(Exception):
     """Неверный запрос API """
-    pass
+
+    @property
+    def retry_after(self):
+        """Пауза из заголовка Retry-After исходной ошибки."""
+        cause = self.args[0] if self.args else None
+        return getattr(cause, 'retry_after', None)
 
 
 class TelegramError(Exception):
@@ -1,3 +1,5 @@
+import asyncio
+import functools
 import logging
 import os
 import sys
@@ -12,6 +14,13 @@ from exceptions import (ErrorResponse,
                         WrongKeyHomeworks,
 
                         )
+from async_bot import AsyncTransport, run_async
+from http_client import create_session, parse_retry_after
+from response_cache import NOT_MODIFIED, ResponseCache
+from scheduler import PollScheduler
+from state import diff_statuses
+from storage import CheckpointStore, open_store
+from tenants import load_registry
 
 from dotenv import load_dotenv
 
@@ -20,6 +29,17 @@ load_dotenv()
 PRACTICUM_TOKEN = os.getenv('PRACTICUM_TOKEN')
 TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
+TENANTS_FILE = os.getenv('TENANTS_FILE')
+ASYNC_MODE = os.getenv('ASYNC_MODE', '') not in ('', '0')
+MAX_CONCURRENCY = int(os.getenv('MAX_CONCURRENCY', 100))
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', 10))
+HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', 3))
+REVIEWING_RETRY_TIME = int(os.getenv('REVIEWING_RETRY_TIME', 120))
+BACKOFF_BASE = int(os.getenv('BACKOFF_BASE', 60))
+MAX_BACKOFF = int(os.getenv('MAX_BACKOFF', 3600))
+CHECKPOINT_FILE = os.getenv('CHECKPOINT_FILE')
+CHECKPOINT_BATCH = int(os.getenv('CHECKPOINT_BATCH', 50))
+CHECKPOINT_INTERVAL = int(os.getenv('CHECKPOINT_INTERVAL', 30))
 
 RETRY_TIME = 600
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
@@ -34,8 +54,13 @@ HOMEWORK_STATUSES = {
 
 def send_message(bot, message):
     """Отправка сообщения в Telegram чат."""
+    send_to_chat(bot, TELEGRAM_CHAT_ID, message)
+
+
+def send_to_chat(bot, chat_id, message):
+    """Отправка сообщения в указанный Telegram чат."""
     try:
-        bot.send_message(TELEGRAM_CHAT_ID, message)
+        bot.send_message(chat_id, message)
         logging.info('Отправляем сообщение')
     except Exception:
         raise TelegramError(f'Сбои при отправке сообщения в Telegram: '
@@ -46,20 +71,43 @@ def send_message(bot, message):
 
 def get_api_answer(current_timestamp):
     """Выполнение запроса к эндпоинту API-сервиса."""
+    return fetch_homework_statuses(current_timestamp, HEADERS)
+
+
+def fetch_homework_statuses(current_timestamp, headers, session=None):
+    """Запрос к API-сервису с заголовками конкретной подписки.
+
+    Если передана сессия, запрос идёт через её пул соединений.
+    """
+    response = request_homework_statuses(current_timestamp, headers, session)
+    try:
+        return response.json()
+    except Exception as error:
+        raise BadAPIRequest(error)
+
+
+def request_homework_statuses(current_timestamp, headers, session=None):
+    """Запрос к API-сервису без декодирования тела ответа.
+
+    Ответ 304 допустим только для условного запроса с If-None-Match.
+    """
     timestamp = current_timestamp or int(time.time())
     params = {'from_date': timestamp}
+    client = session or requests
+    allowed = (200, NOT_MODIFIED) if 'If-None-Match' in headers else (200,)
     try:
-        response = requests.get(ENDPOINT, headers=HEADERS, params=params)
+        response = client.get(ENDPOINT, headers=headers, params=params)
         logging.info(f'Отправляем запрос к API. endpoint: {ENDPOINT},'
-                     f'headers: {HEADERS}, params: {params}')
-        if response.status_code != 200:
+                     f'headers: {headers}, params: {params}')
+        if response.status_code not in allowed:
             error = (f'Неудовлетворительный статус ответа:'
                      f' {response.status_code},'
                      f' Причина: {response.reason},'
                      f' Текст ответа: {response.text},'
                      f' с параметрами: {params}')
-            raise ErrorResponse(error)
-        return response.json()
+            retry_after = getattr(response, 'headers', {}).get('Retry-After')
+            raise ErrorResponse(error, parse_retry_after(retry_after))
+        return response
     except Exception as error:
         raise BadAPIRequest(error)
 
@@ -104,6 +152,8 @@ def parse_status(homework):
 
 def check_tokens():
     """Проверка доступности переменных окружения."""
+    if TENANTS_FILE and TELEGRAM_TOKEN:
+        return True
     if not PRACTICUM_TOKEN:
         logging.critical(
             "Отсутствует обязательная переменная окружения:"
@@ -122,41 +172,144 @@ def check_tokens():
     return True
 
 
-# flake8: noqa: C901
+def collect_updates(tenant, all_homework):
+    """Сообщения об изменившихся статусах из ответа API."""
+    check_response_work = check_response(all_homework)
+    changed = diff_statuses(tenant.statuses, check_response_work)
+    messages = [parse_status(homework) for _, homework in changed.values()]
+    for key, (status, _) in changed.items():
+        tenant.statuses[key] = status
+    if not changed:
+        logging.debug('Статус не изменился')
+    tenant.from_date = all_homework.get('current_date')
+    tenant.last_error = ''
+    return messages
+
+
+def process_answer(tenant, answer):
+    """Сообщения по ответу API; повторный ответ не разбирается."""
+    all_homework, current_date = answer
+    if all_homework is not None:
+        return collect_updates(tenant, all_homework)
+    logging.debug('Ответ API не изменился')
+    if current_date:
+        tenant.from_date = current_date
+    tenant.last_error = ''
+    return []
+
+
+def describe_failure(tenant, error):
+    """Сообщение о сбое, если о нём ещё не сообщали."""
+    message = f'Сбой в работе программы: {error}'
+    logging.exception(message)
+    if message == tenant.last_error:
+        return []
+    tenant.last_error = message
+    return [message]
+
+
+class Runtime:
+    """Общие ресурсы процесса, которыми пользуются все подписки."""
+
+    def __init__(self, bot, session=None, cache=None, store=None):
+        self.bot = bot
+        self.session = session
+        self.cache = cache or ResponseCache()
+        self.store = store or CheckpointStore()
+
+    def fetch(self, tenant):
+        """Условный запрос к API через общую сессию."""
+        key = tenant.tenant_id
+        headers = self.cache.prepare(key, tenant.headers)
+        response = request_homework_statuses(tenant.from_date, headers,
+                                             self.session)
+        try:
+            return self.cache.decode(key, response.status_code,
+                                     response.headers.get('ETag'),
+                                     response.content)
+        except Exception as error:
+            raise BadAPIRequest(error)
+
+    def send(self, chat_id, message):
+        """Отправка сообщения общим ботом."""
+        send_to_chat(self.bot, chat_id, message)
+
+
+def poll_tenant(runtime, tenant):
+    """Один цикл опроса API и уведомления для одной подписки.
+
+    Возвращает ошибку опроса или None, чтобы планировщик выбрал паузу.
+    """
+    failure = None
+    try:
+        messages = process_answer(tenant, runtime.fetch(tenant))
+    except Exception as error:
+        failure = error
+        runtime.cache.forget(tenant.tenant_id)
+        messages = describe_failure(tenant, error)
+    for message in messages:
+        try:
+            runtime.send(tenant.chat_id, message)
+            logging.info('Сообщение отправлено')
+        except TelegramError as error:
+            logging.error(f'Ошибка при отправке сообщения: {error}')
+    runtime.store.save(tenant)
+    return failure
+
+
+async def poll_tenant_async(runtime, transport, tenant):
+    """Асинхронный цикл опроса API и уведомления для одной подписки."""
+    failure = None
+    try:
+        messages = process_answer(tenant, await transport.fetch(tenant))
+    except Exception as error:
+        failure = error
+        transport.cache.forget(tenant.tenant_id)
+        messages = describe_failure(tenant, error)
+    for message in messages:
+        try:
+            await transport.send(tenant.chat_id, message)
+            logging.info('Сообщение отправлено')
+        except TelegramError as error:
+            logging.error(f'Ошибка при отправке сообщения: {error}')
+    runtime.store.save(tenant)
+    return failure
+
+
+def run_forever(runtime, scheduler):
+    """Синхронный цикл опроса подписок по очереди."""
+    while True:
+        tenant = scheduler.next_due()
+        error = poll_tenant(runtime, tenant)
+        scheduler.reschedule(tenant, error)
+
+
 def main():
     """Основная функция."""
     if not check_tokens():
         sys.exit()
     bot = telegram.Bot(token=TELEGRAM_TOKEN)
-    current_timestamp = int(time.time() - 30 * 24 * 60 * 60)
-    previous_error = {}
-    current_error = {}
-    old_homework_status = ''
-    while True:
-        try:
-            all_homework = get_api_answer(current_timestamp)
-            check_response_work = check_response(all_homework)
-            if len(check_response_work) > 0:
-                homework = check_response_work[0]
-                homework_status = parse_status(homework)
-                if homework_status != old_homework_status:
-                    old_homework_status = homework_status
-                    send_message(bot, homework_status)
-                    logging.info('Сообщение отправлено')
-                else:
-                    logging.debug('Статус не изменился')
-            current_timestamp = all_homework.get('current_date')
-        except TelegramError as error:
-            logging.error(f'Ошибка при запросе к основному API: {error}')
-        except Exception as error:
-            message = f'Сбой в работе программы: {error}'
-            logging.exception(message)
-            current_error['message'] = message
-            if previous_error != current_error:
-                send_message(bot, message)
-                previous_error = current_error.copy()
-        finally:
-            time.sleep(RETRY_TIME)
+    store = open_store(CHECKPOINT_FILE, batch_size=CHECKPOINT_BATCH,
+                       flush_interval=CHECKPOINT_INTERVAL)
+    runtime = Runtime(bot, create_session(HTTP_POOL_SIZE, HTTP_RETRIES),
+                      store=store)
+    registry = load_registry(TENANTS_FILE, PRACTICUM_TOKEN, TELEGRAM_CHAT_ID)
+    store.restore(registry)
+    scheduler = PollScheduler(RETRY_TIME, REVIEWING_RETRY_TIME,
+                              BACKOFF_BASE, MAX_BACKOFF)
+    scheduler.schedule_all(registry)
+    try:
+        if ASYNC_MODE:
+            transport = AsyncTransport(
+                ENDPOINT, TELEGRAM_TOKEN, MAX_CONCURRENCY,
+                runtime.fetch, runtime.send, runtime.cache)
+            poll = functools.partial(poll_tenant_async, runtime)
+            asyncio.run(run_async(scheduler, transport, poll,
+                                  MAX_CONCURRENCY))
+        else:
+            run_forever(runtime, scheduler)
+    finally:
+        store.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,37 @@
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+def create_session(pool_size=10, retries=3, backoff=0.5):
+    """HTTP-сессия с пулом keep-alive соединений и повтором запросов."""
+    session = requests.Session()
+    retry = Retry(total=retries, connect=retries, read=retries,
+                  backoff_factor=backoff,
+                  status_forcelist=RETRY_STATUSES,
+                  raise_on_status=False,
+                  respect_retry_after_status=False)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size,
+                          max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Connection'] = 'keep-alive'
+    return session
+
+
+def parse_retry_after(value):
+    """Секунды ожидания из заголовка Retry-After (число или HTTP-дата)."""
+    if not value:
+        return None
+    if value.isdigit():
+        return int(value)
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(moment.timestamp() - time.time(), 0)
@@ -0,0 +1,71 @@
+import hashlib
+import json
+import re
+
+NOT_MODIFIED = 304
+CURRENT_DATE = re.compile(rb'"current_date"\s*:\s*(\d+)')
+
+
+class ResponseCache:
+    """Отпечатки последних ответов API по подпискам.
+
+    Ответ, совпадающий с предыдущим с точностью до current_date,
+    не декодируется и не проверяется повторно.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self.hits = 0
+        self.not_modified = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self):
+        """Доля ответов, обработанных без декодирования JSON."""
+        total = self.hits + self.not_modified + self.misses
+        if not total:
+            return 0.0
+        return (self.hits + self.not_modified) / total
+
+    def prepare(self, key, headers):
+        """Заголовки запроса с If-None-Match, если известен ETag."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] is None:
+            return headers
+        return dict(headers, **{'If-None-Match': entry[0]})
+
+    def decode(self, key, status, etag, body):
+        """Разбор ответа: (данные, None) или (None, current_date) при повторе.
+
+        current_date равен None, если сервер ответил 304.
+        """
+        if status == NOT_MODIFIED:
+            self.not_modified += 1
+            return None, None
+        digest = hashlib.blake2b(digest_size=16)
+        match = CURRENT_DATE.search(body)
+        current_date = None
+        if match:
+            view = memoryview(body)
+            digest.update(view[:match.start()])
+            digest.update(view[match.end():])
+            current_date = int(match.group(1))
+        else:
+            digest.update(body)
+        fingerprint = digest.digest()
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] == fingerprint:
+            self.hits += 1
+            return None, current_date
+        self.misses += 1
+        self._entries[key] = (etag, fingerprint)
+        return json.loads(body), None
+
+    def forget(self, key):
+        """Сброс отпечатка, если ответ не прошёл обработку."""
+        self._entries.pop(key, None)
+
+    def stats(self):
+        """Счётчики попаданий для логов и метрик."""
+        return {'hits': self.hits, 'not_modified': self.not_modified,
+                'misses': self.misses, 'hit_rate': self.hit_rate}
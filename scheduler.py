@@ -0,0 +1,79 @@
+import heapq
+import itertools
+import random
+import time
+
+from exceptions import BadAPIRequest, ErrorResponse
+
+
+class PollScheduler:
+    """Очередь опроса подписок, упорядоченная по времени следующего запроса.
+
+    Интервал подстраивается под подписку: пока работа на ревью,
+    опрос идёт чаще, после сбоев API — с экспоненциальной задержкой.
+    """
+
+    def __init__(self, interval, reviewing_interval=None, backoff_base=60,
+                 max_backoff=3600, clock=time.monotonic, sleep=time.sleep,
+                 jitter=random.random):
+        self.interval = interval
+        self.reviewing_interval = reviewing_interval or interval
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self._clock = clock
+        self._sleep = sleep
+        self._jitter = jitter
+        self._heap = []
+        self._counter = itertools.count()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def schedule(self, tenant, delay=0):
+        """Постановка подписки в очередь через delay секунд."""
+        due = self._clock() + delay
+        heapq.heappush(self._heap, (due, next(self._counter), tenant))
+
+    def schedule_all(self, tenants):
+        """Первый опрос подписок, равномерно распределённый по интервалу."""
+        tenants = list(tenants)
+        step = self.interval / len(tenants) if tenants else 0
+        for number, tenant in enumerate(tenants):
+            self.schedule(tenant, number * step)
+
+    def next_interval(self, tenant, error=None):
+        """Задержка до следующего опроса по итогам последнего."""
+        if not isinstance(error, (BadAPIRequest, ErrorResponse)):
+            tenant.failures = 0
+            if 'reviewing' in tenant.statuses.values():
+                return self.reviewing_interval
+            return self.interval
+        tenant.failures += 1
+        delay = min(self.max_backoff,
+                    self.backoff_base * 2 ** (tenant.failures - 1))
+        delay = delay / 2 + self._jitter() * delay / 2
+        retry_after = getattr(error, 'retry_after', None)
+        if retry_after:
+            delay = max(delay, retry_after)
+        return delay
+
+    def reschedule(self, tenant, error=None):
+        """Повторная постановка подписки после опроса."""
+        self.schedule(tenant, self.next_interval(tenant, error))
+
+    def delay(self):
+        """Секунды до ближайшего запланированного опроса."""
+        if not self._heap:
+            return self.interval
+        return max(self._heap[0][0] - self._clock(), 0)
+
+    def pop(self):
+        """Извлечение ближайшей подписки без ожидания."""
+        return heapq.heappop(self._heap)[2]
+
+    def next_due(self):
+        """Ожидание и выдача подписки, чья очередь подошла."""
+        delay = self.delay()
+        if delay > 0:
+            self._sleep(delay)
+        return self.pop()
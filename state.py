@@ -0,0 +1,24 @@
+def homework_key(homework):
+    """Ключ домашней работы в карте статусов: id или название."""
+    key = homework.get('id')
+    if key is None:
+        key = homework.get('homework_name')
+    return key
+
+
+def diff_statuses(known, homeworks):
+    """Работы из ответа API, статус которых отличается от known.
+
+    Возвращает словарь {ключ: (статус, работа)} в хронологическом
+    порядке: API отдаёт свежие работы первыми. Карта known
+    не изменяется, чтобы сбой при разборе не терял переходы.
+    """
+    changed = {}
+    for homework in reversed(homeworks):
+        if not isinstance(homework, dict):
+            raise TypeError(f'Homework не является словарем {homework}')
+        key = homework_key(homework)
+        status = homework.get('status')
+        if key is None or known.get(key) != status:
+            changed[key] = (status, homework)
+    return changed
@@ -0,0 +1,176 @@
+import json
+import logging
+import os
+import sqlite3
+import time
+
+
+class CheckpointStore:
+    """Хранилище курсоров и статусов подписок.
+
+    Базовый класс ничего не сохраняет. Изменения копятся в памяти
+    и записываются пачкой, когда их набирается batch_size или
+    проходит flush_interval секунд.
+    """
+
+    def __init__(self, batch_size=50, flush_interval=30,
+                 clock=time.monotonic):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._clock = clock
+        self._dirty = {}
+        self._flushed_at = clock()
+
+    def load_all(self):
+        """Сохранённые состояния: {tenant_id: состояние}."""
+        return {}
+
+    def restore(self, registry):
+        """Восстановление состояния подписок реестра."""
+        states = self.load_all()
+        restored = 0
+        for tenant in registry:
+            state = states.get(tenant.tenant_id)
+            if state is None:
+                continue
+            tenant.from_date = state['from_date']
+            tenant.statuses = dict(state['statuses'])
+            tenant.last_error = state['last_error']
+            restored += 1
+        if restored:
+            logging.info(f'Восстановлено состояние подписок: {restored}')
+        return restored
+
+    def save(self, tenant):
+        """Отметка подписки как изменённой; запись по накоплении пачки."""
+        self._dirty[tenant.tenant_id] = tenant
+        if (len(self._dirty) >= self.batch_size
+                or self._clock() - self._flushed_at >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Запись всех накопленных изменений."""
+        if self._dirty:
+            states = {tenant_id: dump_state(tenant)
+                      for tenant_id, tenant in self._dirty.items()}
+            self._write(states)
+            self._dirty.clear()
+        self._flushed_at = self._clock()
+
+    def close(self):
+        """Запись остатка изменений и освобождение ресурсов."""
+        self.flush()
+
+    def _write(self, states):
+        pass
+
+
+def dump_state(tenant):
+    """Сохраняемая часть состояния подписки."""
+    return {
+        'from_date': tenant.from_date,
+        # JSON не хранит числовые ключи, поэтому id работ приводятся к str.
+        'statuses': {str(key): status
+                     for key, status in tenant.statuses.items()},
+        'last_error': tenant.last_error,
+    }
+
+
+def _restore_keys(statuses):
+    """Числовые id работ обратно в int, как в ответе API."""
+    return {int(key) if key.isdigit() else key: status
+            for key, status in statuses.items()}
+
+
+class JsonCheckpointStore(CheckpointStore):
+    """Состояние в JSON-файле, перезаписываемом атомарно."""
+
+    def __init__(self, path, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self._states = self._read()
+
+    def _read(self):
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                states = json.load(file)
+        except FileNotFoundError:
+            return {}
+        for state in states.values():
+            state['statuses'] = _restore_keys(state['statuses'])
+        return states
+
+    def load_all(self):
+        """Сохранённые состояния: {tenant_id: состояние}."""
+        return self._states
+
+    def _write(self, states):
+        self._states.update(states)
+        temporary = f'{self.path}.tmp'
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(self._states, file, ensure_ascii=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.path)
+        directory = os.open(os.path.dirname(os.path.abspath(self.path)),
+                            os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+
+class SqliteCheckpointStore(CheckpointStore):
+    """Состояние в базе SQLite, пачка пишется одной транзакцией."""
+
+    def __init__(self, path, **kwargs):
+        super().__init__(**kwargs)
+        self._connection = sqlite3.connect(path)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=FULL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS checkpoints ('
+            'tenant_id TEXT PRIMARY KEY, from_date INTEGER, '
+            'statuses TEXT, last_error TEXT)'
+        )
+        self._connection.commit()
+
+    def load_all(self):
+        """Сохранённые состояния: {tenant_id: состояние}."""
+        rows = self._connection.execute(
+            'SELECT tenant_id, from_date, statuses, last_error '
+            'FROM checkpoints'
+        )
+        return {
+            tenant_id: {
+                'from_date': from_date,
+                'statuses': _restore_keys(json.loads(statuses)),
+                'last_error': last_error,
+            }
+            for tenant_id, from_date, statuses, last_error in rows
+        }
+
+    def _write(self, states):
+        with self._connection:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?)',
+                [(tenant_id, state['from_date'],
+                  json.dumps(state['statuses'], ensure_ascii=False),
+                  state['last_error'])
+                 for tenant_id, state in states.items()]
+            )
+
+    def close(self):
+        """Запись остатка изменений и закрытие базы."""
+        super().close()
+        self._connection.close()
+
+
+def open_store(path, **kwargs):
+    """Хранилище по расширению файла; без пути состояние не сохраняется."""
+    if not path:
+        return CheckpointStore(**kwargs)
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.db', '.sqlite', '.sqlite3'):
+        return SqliteCheckpointStore(path, **kwargs)
+    return JsonCheckpointStore(path, **kwargs)
@@ -0,0 +1,103 @@
+import json
+import logging
+import os
+import sqlite3
+import time
+
+HISTORY_DEPTH = 30 * 24 * 60 * 60
+
+
+class Tenant:
+    """Подписка: токен Практикума и чат, куда отправлять статусы."""
+
+    __slots__ = ('tenant_id', 'token', 'chat_id', 'headers',
+                 'from_date', 'statuses', 'last_error', 'failures')
+
+    def __init__(self, tenant_id, token, chat_id, from_date=None):
+        self.tenant_id = str(tenant_id)
+        self.token = token
+        self.chat_id = chat_id
+        self.headers = {'Authorization': f'OAuth {token}'}
+        if from_date is None:
+            from_date = int(time.time() - HISTORY_DEPTH)
+        self.from_date = from_date
+        self.statuses = {}
+        self.last_error = ''
+        self.failures = 0
+
+    def __repr__(self):
+        return f'Tenant({self.tenant_id!r}, chat_id={self.chat_id!r})'
+
+
+class TenantRegistry:
+    """Набор подписок, которые обслуживает процесс."""
+
+    def __init__(self, tenants=()):
+        self._tenants = {}
+        for tenant in tenants:
+            self.add(tenant)
+
+    def add(self, tenant):
+        """Добавление подписки в реестр."""
+        if tenant.tenant_id in self._tenants:
+            raise ValueError(f'Подписка {tenant.tenant_id} уже существует')
+        self._tenants[tenant.tenant_id] = tenant
+
+    def get(self, tenant_id):
+        """Подписка по идентификатору."""
+        return self._tenants[tenant_id]
+
+    def __iter__(self):
+        return iter(list(self._tenants.values()))
+
+    def __len__(self):
+        return len(self._tenants)
+
+
+def _tenant_from_record(record):
+    """Подписка из записи файла реестра."""
+    for key in ('practicum_token', 'chat_id'):
+        if not record.get(key):
+            raise KeyError(f'В записи подписки нет ключа {key}: {record}')
+    tenant_id = record.get('id') or record['chat_id']
+    return Tenant(tenant_id, record['practicum_token'], record['chat_id'],
+                  record.get('from_date'))
+
+
+def load_json_registry(path):
+    """Реестр из JSON-файла со списком подписок."""
+    with open(path, encoding='utf-8') as file:
+        records = json.load(file)
+    if not isinstance(records, list):
+        raise TypeError(f'Файл {path} должен содержать список подписок')
+    return TenantRegistry(_tenant_from_record(record) for record in records)
+
+
+def load_sqlite_registry(path):
+    """Реестр из таблицы tenants базы SQLite."""
+    connection = sqlite3.connect(path)
+    connection.row_factory = sqlite3.Row
+    try:
+        rows = connection.execute(
+            'SELECT id, practicum_token, chat_id FROM tenants'
+        ).fetchall()
+    finally:
+        connection.close()
+    return TenantRegistry(_tenant_from_record(dict(row)) for row in rows)
+
+
+def load_registry(path, practicum_token=None, chat_id=None):
+    """Загрузка реестра подписок.
+
+    Без файла реестра процесс обслуживает одну подписку
+    из переменных окружения.
+    """
+    if not path:
+        return TenantRegistry([Tenant(chat_id, practicum_token, chat_id)])
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.db', '.sqlite', '.sqlite3'):
+        registry = load_sqlite_registry(path)
+    else:
+        registry = load_json_registry(path)
+    logging.info(f'Загружено подписок: {len(registry)} из {path}')
+    return registry
@@ -0,0 +1,52 @@
+import asyncio
+
+from async_bot import AsyncTransport, run_async
+from scheduler import PollScheduler
+from tenants import Tenant
+
+
+class TestRunAsync:
+
+    def test_bounded_concurrency(self):
+        tenants = list(range(20))
+        polled = []
+        state = {'active': 0, 'peak': 0}
+
+        async def scenario():
+            stop = asyncio.Event()
+
+            async def poll(transport, tenant):
+                state['active'] += 1
+                state['peak'] = max(state['peak'], state['active'])
+                await asyncio.sleep(0.01)
+                state['active'] -= 1
+                polled.append(tenant)
+                if len(polled) == len(tenants):
+                    stop.set()
+
+            scheduler = PollScheduler(600)
+            for tenant in tenants:
+                scheduler.schedule(tenant)
+            transport = AsyncTransport('http://localhost', 'token', 5,
+                                       None, None)
+            await run_async(scheduler, transport, poll, 5, stop)
+
+        asyncio.run(scenario())
+        assert sorted(polled) == tenants
+        assert state['peak'] == 5
+
+    def test_fetch_falls_back_to_threads(self, monkeypatch):
+        import async_bot
+        monkeypatch.setattr(async_bot, 'aiohttp', None)
+
+        def fetch(tenant):
+            return {'homeworks': [], 'current_date': tenant.from_date}, None
+
+        async def scenario():
+            transport = AsyncTransport('http://localhost', 'token', 2,
+                                       fetch, None)
+            async with transport:
+                return await transport.fetch(Tenant(1, 'token', 1, 42))
+
+        assert asyncio.run(scenario()) == (
+            {'homeworks': [], 'current_date': 42}, None)
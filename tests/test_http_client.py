@@ -0,0 +1,38 @@
+from http import HTTPStatus
+
+from http_client import create_session
+
+
+class FakeResponse:
+    status_code = HTTPStatus.OK
+
+    def json(self):
+        return {'homeworks': [], 'current_date': 1}
+
+
+class FakeSession:
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, **kwargs):
+        self.calls.append(url)
+        return FakeResponse()
+
+
+class TestHttpClient:
+
+    def test_pool_settings(self):
+        session = create_session(pool_size=25, retries=2)
+        adapter = session.get_adapter('https://practicum.yandex.ru/')
+        assert adapter._pool_maxsize == 25
+        assert adapter.max_retries.total == 2
+
+    def test_fetch_uses_session(self):
+        import homework
+
+        session = FakeSession()
+        result = homework.fetch_homework_statuses(
+            1, {'Authorization': 'OAuth x'}, session)
+        assert result['current_date'] == 1
+        assert session.calls == [homework.ENDPOINT]
@@ -0,0 +1,40 @@
+from response_cache import ResponseCache
+
+
+class TestResponseCache:
+
+    def test_repeated_body_is_not_decoded(self):
+        cache = ResponseCache()
+        first = b'{"homeworks": [{"status": "reviewing"}], "current_date": 1}'
+        second = b'{"homeworks": [{"status": "reviewing"}], "current_date": 2}'
+        data, current_date = cache.decode('a', 200, None, first)
+        assert data['current_date'] == 1 and current_date is None
+        assert cache.decode('a', 200, None, second) == (None, 2)
+        assert cache.stats()['hits'] == 1
+        assert cache.hit_rate == 0.5
+
+    def test_changed_body_is_decoded(self):
+        cache = ResponseCache()
+        cache.decode('a', 200, None, b'{"homeworks": [], "current_date": 1}')
+        data, _ = cache.decode(
+            'a', 200, None,
+            b'{"homeworks": [{"status": "approved"}], "current_date": 2}')
+        assert data['homeworks'] == [{'status': 'approved'}]
+        assert cache.misses == 2
+
+    def test_etag_and_not_modified(self):
+        cache = ResponseCache()
+        headers = {'Authorization': 'OAuth x'}
+        assert cache.prepare('a', headers) is headers
+        cache.decode('a', 200, '"v1"', b'{"homeworks": [], "current_date": 1}')
+        assert cache.prepare('a', headers)['If-None-Match'] == '"v1"'
+        assert cache.decode('a', 304, None, b'') == (None, None)
+        assert cache.not_modified == 1
+
+    def test_forget(self):
+        cache = ResponseCache()
+        body = b'{"current_date": 1}'
+        cache.decode('a', 200, None, body)
+        cache.forget('a')
+        data, _ = cache.decode('a', 200, None, body)
+        assert data == {'current_date': 1}
@@ -0,0 +1,65 @@
+import pytest
+
+from state import diff_statuses
+from tenants import Tenant
+
+
+class TestDiffStatuses:
+
+    def test_only_changed_in_chronological_order(self):
+        known = {1: 'reviewing', 2: 'approved'}
+        homeworks = [
+            {'id': 3, 'homework_name': 'c', 'status': 'reviewing'},
+            {'id': 2, 'homework_name': 'b', 'status': 'approved'},
+            {'id': 1, 'homework_name': 'a', 'status': 'rejected'},
+        ]
+        changed = diff_statuses(known, homeworks)
+        assert list(changed) == [1, 3]
+        assert known == {1: 'reviewing', 2: 'approved'}
+
+    def test_name_is_key_without_id(self):
+        changed = diff_statuses({'a': 'approved'},
+                                [{'homework_name': 'a', 'status': 'approved'}])
+        assert changed == {}
+
+    def test_not_dict(self):
+        with pytest.raises(TypeError):
+            diff_statuses({}, ['homework'])
+
+
+class TestCollectUpdates:
+
+    def test_one_message_per_changed_homework(self):
+        import homework
+
+        tenant = Tenant(1, 'token', 1)
+        response = {
+            'homeworks': [
+                {'id': 2, 'homework_name': 'b', 'status': 'approved'},
+                {'id': 1, 'homework_name': 'a', 'status': 'reviewing'},
+            ],
+            'current_date': 100,
+        }
+        messages = homework.collect_updates(tenant, response)
+        assert len(messages) == 2
+        assert messages[0].startswith('Изменился статус проверки работы "a"')
+        assert tenant.from_date == 100
+        assert homework.collect_updates(tenant, response) == []
+        response['homeworks'][1]['status'] = 'rejected'
+        messages = homework.collect_updates(tenant, response)
+        assert len(messages) == 1 and '"a"' in messages[0]
+
+    def test_failed_parse_keeps_state(self):
+        import homework
+
+        tenant = Tenant(1, 'token', 1)
+        response = {
+            'homeworks': [
+                {'id': 2, 'homework_name': 'b', 'status': 'unknown'},
+                {'id': 1, 'homework_name': 'a', 'status': 'reviewing'},
+            ],
+            'current_date': 100,
+        }
+        with pytest.raises(homework.UnknownStatusHW):
+            homework.collect_updates(tenant, response)
+        assert tenant.statuses == {}
@@ -0,0 +1,48 @@
+import pytest
+
+from storage import CheckpointStore, open_store
+from tenants import Tenant, TenantRegistry
+
+
+def make_tenant():
+    tenant = Tenant('a', 'token', 1, from_date=100)
+    tenant.statuses = {1: 'reviewing', 'hw': 'approved'}
+    tenant.last_error = 'Сбой'
+    return tenant
+
+
+class TestCheckpointStore:
+
+    @pytest.mark.parametrize('name', ['state.json', 'state.db'])
+    def test_roundtrip(self, tmp_path, name):
+        path = str(tmp_path / name)
+        store = open_store(path)
+        store.save(make_tenant())
+        store.close()
+
+        tenant = Tenant('a', 'token', 1)
+        registry = TenantRegistry([tenant, Tenant('b', 'token', 2)])
+        store = open_store(path)
+        assert store.restore(registry) == 1
+        store.close()
+        assert tenant.from_date == 100
+        assert tenant.statuses == {1: 'reviewing', 'hw': 'approved'}
+        assert tenant.last_error == 'Сбой'
+
+    def test_batched_flush(self):
+        now = [0]
+        written = []
+
+        class Store(CheckpointStore):
+            def _write(self, states):
+                written.append(sorted(states))
+
+        store = Store(batch_size=2, flush_interval=10, clock=lambda: now[0])
+        store.save(Tenant('a', 'token', 1))
+        assert written == []
+        store.save(Tenant('b', 'token', 2))
+        assert written == [['a', 'b']]
+        store.save(Tenant('c', 'token', 3))
+        now[0] = 10
+        store.save(Tenant('c', 'token', 3))
+        assert written == [['a', 'b'], ['c']]
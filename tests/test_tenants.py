@@ -0,0 +1,73 @@
+import json
+import sqlite3
+
+import pytest
+
+import tenants
+from scheduler import PollScheduler
+
+
+class TestTenants:
+
+    def test_env_registry(self):
+        registry = tenants.load_registry(None, 'token', 12345)
+        assert len(registry) == 1
+        tenant = next(iter(registry))
+        assert tenant.chat_id == 12345
+        assert tenant.headers == {'Authorization': 'OAuth token'}
+
+    def test_json_registry(self, tmp_path):
+        path = tmp_path / 'tenants.json'
+        path.write_text(json.dumps([
+            {'practicum_token': 'a', 'chat_id': 1},
+            {'id': 'second', 'practicum_token': 'b', 'chat_id': 2,
+             'from_date': 100},
+        ]))
+        registry = tenants.load_registry(str(path))
+        assert len(registry) == 2
+        assert registry.get('second').from_date == 100
+        assert registry.get('1').token == 'a'
+
+    def test_json_registry_missing_key(self, tmp_path):
+        path = tmp_path / 'tenants.json'
+        path.write_text(json.dumps([{'chat_id': 1}]))
+        with pytest.raises(KeyError):
+            tenants.load_registry(str(path))
+
+    def test_sqlite_registry(self, tmp_path):
+        path = str(tmp_path / 'tenants.db')
+        connection = sqlite3.connect(path)
+        connection.execute(
+            'CREATE TABLE tenants (id TEXT, practicum_token TEXT, chat_id)'
+        )
+        connection.executemany('INSERT INTO tenants VALUES (?, ?, ?)',
+                               [('a', 'ta', 1), ('b', 'tb', 2)])
+        connection.commit()
+        connection.close()
+        registry = tenants.load_registry(path)
+        assert sorted(t.tenant_id for t in registry) == ['a', 'b']
+
+    def test_tenant_has_no_dict(self):
+        tenant = tenants.Tenant(1, 'token', 1)
+        assert not hasattr(tenant, '__dict__')
+
+
+class TestPollScheduler:
+
+    def test_order_and_sleep(self):
+        now = [0.0]
+        slept = []
+
+        def sleep(delay):
+            slept.append(delay)
+            now[0] += delay
+
+        scheduler = PollScheduler(10, clock=lambda: now[0], sleep=sleep)
+        scheduler.schedule('a', 5)
+        scheduler.schedule('b')
+        assert scheduler.next_due() == 'b'
+        assert scheduler.next_due() == 'a'
+        assert slept == [5]
+        scheduler.reschedule('a')
+        assert scheduler.next_due() == 'a'
+        assert now[0] == 15